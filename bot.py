@@ -1,30 +1,71 @@
 import os
+import re
+import time
+from functools import partial
+from types import MappingProxyType
 from flask import Flask, request, jsonify
 from dotenv import load_dotenv
-from services.jira_client import JiraAnalyzer
+from services.jira_client import JiraAnalyzer, PRIORITY_CLASSES
 import json
-from slack_sdk import WebClient
+import logging
 import openai
-from threading import Lock, Thread
-import requests
+import httpx
+from threading import Lock, Thread, Timer
+from concurrent.futures import ThreadPoolExecutor
 from helpers.downloader import download_bugs, download_impact_areas
-from messaging.slack_chatter import SlackChatter
+from helpers.parse import NO_DESCRIPTION_IMPACT, iter_parsed_flows
+from messaging.slack_chatter import RESPONSE_URL_TIMEOUT, SlackChatter, http_session
+from messaging.rate_limiter import RateLimitedWebClient
 
 # Load environment variables
 current_dir = os.path.dirname(os.path.abspath(__file__))
 env_path = os.path.join(current_dir, ".env")
 load_dotenv(env_path, override=True)  # Force reload
 
-# Initialize JIRA client
-jira_config = {
-    "server": os.environ.get("JIRA_SERVER"),
-    "email": os.environ.get("JIRA_EMAIL"),
-    "api_token": os.environ.get("JIRA_API_TOKEN"),
-}
+# Configure logging once .env has been loaded, so LOG_LEVEL can be set there
+logging.basicConfig(
+    level=os.environ.get("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.FileHandler("bot.log"), logging.StreamHandler()],
+)
+
+
+analyzer = None
+analyzer_lock = Lock()
+
+
+def get_analyzer():
+    """Connect to JIRA on first use rather than at import time
+
+    Concurrent first calls share one analyzer instead of each connecting.
+    """
+    global analyzer
+    if analyzer is None:
+        with analyzer_lock:
+            if analyzer is None:
+                analyzer = connect_analyzer()
+    return analyzer
+
+
+def connect_analyzer():
+    """JiraAnalyzer configured from the environment"""
+    jira_config = {
+        "server": os.environ.get("JIRA_SERVER"),
+        "email": os.environ.get("JIRA_EMAIL"),
+        "api_token": os.environ.get("JIRA_API_TOKEN"),
+    }
+
+    # Connection pool large enough for the concurrent summary requests
+    # made by the analyzer
+    openai_client = openai.OpenAI(
+        api_key=os.environ.get("OPENAI_API_KEY"),
+        http_client=httpx.Client(
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+            timeout=httpx.Timeout(30.0),
+        ),
+    )
+    return JiraAnalyzer(jira_config, openai_client=openai_client)
 
-# Initialize clients
-openai_client = openai.OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
-analyzer = JiraAnalyzer(jira_config)
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -33,10 +74,15 @@ app = Flask(__name__)
 response_lock = Lock()
 last_response_time = {}
 RESPONSE_COOLDOWN = 2  # seconds
-cached_components = set()
+# Sorted (name, lowercased name, lowercased words) for every JIRA component,
+# built from the analyzer's cached component list it was indexed from
+components_cache = {"index": None, "components": None}
 message_tracking = {}
 processed_messages = set()
 processed_requests = set()
+DEBOUNCE_SECONDS = 1.5
+pending_requests = {}  # (channel, user) -> Timer for the latest DM request
+pending_lock = Lock()
 
 
 @app.before_request
@@ -50,8 +96,20 @@ def before_request():
                 return jsonify({"error": "Invalid JSON"}), 400
 
 
-# Initialize Slack client
-slack_client = WebClient(token=os.environ.get("SLACK_BOT_TOKEN"))
+# Initialize Slack client, paced to stay under Slack's per-method rate limits
+slack_client = RateLimitedWebClient(token=os.environ.get("SLACK_BOT_TOKEN"))
+
+# Shared pool for Slack calls that can overlap with slower work
+executor = ThreadPoolExecutor(max_workers=8)
+
+# CSV exports get their own bounded pool so a burst of downloads queues up
+# instead of starving the shared pool or flooding JIRA and Slack
+export_executor = ThreadPoolExecutor(max_workers=4)
+
+# Common fields for response_url posts, sent over SlackChatter's session
+EPHEMERAL_REPLACE = MappingProxyType(
+    {"replace_original": True, "response_type": "ephemeral"}
+)
 
 # Dictionary to track the last request time for each user
 user_request_times = {}
@@ -72,17 +130,23 @@ def slack_events():
             if "type" in data and data["type"] == "url_verification":
                 return jsonify({"challenge": data["challenge"]})
 
+            # Handle events in the background so Slack gets its ack right away
+            # and doesn't retry the event while JIRA is still being queried
             if data.get("type") == "event_callback":
                 event = data.get("event", {})
+                handler = None
                 if event.get("type") == "app_home_opened":
-                    handle_app_home_opened(event)
+                    handler = handle_app_home_opened
                 elif event.get("type") == "app_mention":
-                    handle_mention(event)
+                    handler = handle_mention
                 elif (
                     event.get("type") == "message" and event.get("channel_type") == "im"
                 ):
                     if "bot_id" not in event:
-                        handle_message_event(event)
+                        handler = handle_message_event
+
+                if handler:
+                    Thread(target=handler, args=(event,)).start()
 
             return "", 200
 
@@ -103,212 +167,174 @@ def slack_events():
 
             if "actions" in payload:
                 action = payload["actions"][0]
-                action_id = action["action_id"]
                 channel = payload["container"]["channel_id"]
                 user = payload["user"]["id"]
+                response_url = payload.get("response_url")
 
                 # Create a single SlackChatter instance for this request
                 slack_chatter = SlackChatter(
-                    slack_client, channel, response_url=payload.get("response_url")
+                    slack_client, channel, response_url=response_url
                 )
 
-                # Handle component selection from buttons
-                if action_id.startswith("select_component_"):
-                    component = action_id.split("select_component_")[1]
-                    response_url = payload["response_url"]
-
-                    def process_component_selection(response_url):
-                        try:
-                            # Send results directly to response_url
-                            requests.post(
-                                response_url,
-                                json={
-                                    "blocks": get_analysis_options_blocks(component),
-                                    "replace_original": True,
-                                    "response_type": "ephemeral",
-                                },
-                            )
-                        except Exception as e:
-                            requests.post(
-                                response_url,
-                                json={
-                                    "text": f"❌ Error loading options: {str(e)}",
-                                    "replace_original": True,
-                                    "response_type": "ephemeral",
-                                },
-                            )
-
-                    Thread(
-                        target=process_component_selection,
-                        args=(response_url,),
-                    ).start()
-                    return jsonify({"response_action": "clear"}), 200
-
-                # Handle view selection
-                elif action_id.startswith("view_"):
-                    _, view_type, component = action_id.split("_", 2)
-                    response_url = payload["response_url"]
-
-                    def process_view_selection(response_url, chatter):
-                        try:
-                            # Send initial loading message
-                            requests.post(
-                                response_url,
-                                json={
-                                    "text": "🔄 Starting analysis...",
-                                    "replace_original": True,
-                                    "response_type": "ephemeral",
-                                },
-                            )
-
-                            if view_type == "impact":
-                                status_msg = requests.post(
-                                    response_url,
-                                    json={
-                                        "text": "📊 Fetching issues from JIRA...",
-                                        "replace_original": True,
-                                        "response_type": "ephemeral",
-                                    },
-                                ).json()
-
-                                analysis = analyzer.get_component_analysis(component)
-
-                                requests.post(
-                                    response_url,
-                                    json={
-                                        "text": "🎯 Analyzing impact patterns...",
-                                        "replace_original": True,
-                                        "response_type": "ephemeral",
-                                    },
-                                )
+                # Dispatch on the action prefix, the rest is the component name
+                match = ACTION_PATTERN.match(action["action_id"])
+                if match:
+                    action_type, component = match.groups()
+                    ACTION_HANDLERS[action_type](
+                        component, response_url, channel, user, slack_chatter
+                    )
 
-                                blocks = create_view_blocks(
-                                    view_type, component, analysis, channel, user
-                                )
+            return jsonify({"response_action": "clear"}), 200
 
-                                requests.post(
-                                    response_url,
-                                    json={
-                                        "text": "📝 Formatting results...",
-                                        "replace_original": True,
-                                        "response_type": "ephemeral",
-                                    },
-                                )
+    except Exception as e:
+        return jsonify({"error": str(e)}), 200
 
-                            elif view_type == "bugs":
-                                chatter.emit_message(
-                                    "🐛 Fetching customer reported issues..."
-                                )
-                                analysis = analyzer.get_component_analysis(component)
 
-                                chatter.emit_message(
-                                    "🤖 Generating bug summaries with AI..."
-                                )
-                                blocks = create_view_blocks(
-                                    view_type, component, analysis, channel, user
-                                )
+def post_ephemeral(response_url, text=None, blocks=None):
+    """Replace the original interactive message through its response_url"""
+    payload = dict(EPHEMERAL_REPLACE)
+    if text is not None:
+        payload["text"] = text
+    if blocks is not None:
+        payload["blocks"] = blocks
+    return http_session.post(response_url, json=payload, timeout=RESPONSE_URL_TIMEOUT)
 
-                                chatter.emit_message(
-                                    "📝 Formatting customer bug report..."
-                                )
 
-                            # Send final results through response_url
-                            if blocks:
-                                requests.post(
-                                    response_url,
-                                    json={
-                                        "blocks": blocks,
-                                        "text": f"Analysis results for {component}:",
-                                        "replace_original": True,
-                                        "response_type": "ephemeral",
-                                    },
-                                )
-                            else:
-                                requests.post(
-                                    response_url,
-                                    json={
-                                        "text": f"No {view_type} data found for {component}",
-                                        "replace_original": True,
-                                        "response_type": "ephemeral",
-                                    },
-                                )
+def reply(channel, user=None, **message):
+    """Answer privately when we know who asked, otherwise in the channel"""
+    if user:
+        return slack_client.chat_postEphemeral(channel=channel, user=user, **message)
+    return slack_client.chat_postMessage(channel=channel, **message)
 
-                        except Exception as e:
-                            requests.post(
-                                response_url,
-                                json={
-                                    "text": f"❌ Error analyzing {view_type}: {str(e)}",
-                                    "replace_original": True,
-                                    "response_type": "ephemeral",
-                                },
-                            )
-
-                    Thread(
-                        target=process_view_selection,
-                        args=(response_url, slack_chatter),
-                    ).start()
-                    return jsonify({"response_action": "clear"}), 200
-
-                # Handle download action
-                elif action_id.startswith("download_"):
-                    response_url = payload["response_url"]
-                    if action_id.startswith("download_bugs_"):
-                        component = action_id.split("download_bugs_")[1]
-
-                        def process_download(response_url, component, channel):
-                            try:
-                                download_bugs(
-                                    slack_client, analyzer, component, channel
-                                )
-                            except Exception as e:
-                                requests.post(
-                                    response_url,
-                                    json={
-                                        "text": "❌ Error downloading CSV: " + str(e),
-                                        "replace_original": True,
-                                        "response_type": "ephemeral",
-                                    },
-                                )
 
-                        Thread(
-                            target=process_download,
-                            args=(response_url, component, channel),
-                        ).start()
-                    else:
-                        component = action_id.split("_", 1)[1]
-
-                        def process_download(response_url, component, channel):
-                            try:
-                                download_impact_areas(
-                                    slack_client, analyzer, component, channel
-                                )
-                            except Exception as e:
-                                requests.post(
-                                    response_url,
-                                    json={
-                                        "text": "❌ Error downloading CSV: " + str(e),
-                                        "replace_original": True,
-                                        "response_type": "ephemeral",
-                                    },
-                                )
+def replace_loading_message(channel, ts, user=None, ephemeral=True, **message):
+    """Turn a loading message into the final reply
 
-                        Thread(
-                            target=process_download,
-                            args=(response_url, component, channel),
-                        ).start()
-                    return jsonify({"response_action": "clear"}), 200
+    Ephemeral replies can't reuse a public message, so the loading message is
+    deleted and the reply posted privately instead.
+    """
+    if user and ephemeral:
+        slack_client.chat_delete(channel=channel, ts=ts)
+        return reply(channel, user, **message)
+    return slack_client.chat_update(channel=channel, ts=ts, **message)
 
-            return jsonify({"response_action": "clear"}), 200
 
-    except Exception as e:
-        return jsonify({"error": str(e)}), 200
+def handle_component_selection(component, response_url, channel, user, chatter):
+    """Replace the component picker with the analysis view options"""
+
+    def process_component_selection(response_url):
+        try:
+            # Send results directly to response_url
+            post_ephemeral(
+                response_url, blocks=get_analysis_options_blocks(component)
+            )
+        except Exception as e:
+            post_ephemeral(response_url, f"❌ Error loading options: {str(e)}")
+
+    Thread(
+        target=process_component_selection,
+        args=(response_url,),
+    ).start()
+
+
+def handle_view_selection(view_type, component, response_url, channel, user, chatter):
+    """Run the selected analysis view in the background"""
+
+    def process_view_selection(response_url, chatter):
+        try:
+            # Send initial loading message
+            post_ephemeral(response_url, "🔄 Starting analysis...")
+
+            # Progress updates are posted in the background while the work they
+            # announce runs, waiting on each before sending the next one so
+            # Slack shows them in order
+            if view_type == "impact":
+                status_update = executor.submit(
+                    post_ephemeral, response_url, "📊 Fetching issues from JIRA..."
+                )
+                analysis = get_analyzer().get_component_analysis(component)
+                status_update.result()
+
+                status_update = executor.submit(
+                    post_ephemeral, response_url, "🎯 Analyzing impact patterns..."
+                )
+                blocks = create_view_blocks(
+                    view_type, component, analysis, channel, user
+                )
+                status_update.result()
+
+                post_ephemeral(response_url, "📝 Formatting results...")
+
+            elif view_type == "bugs":
+                status_update = executor.submit(
+                    chatter.emit_message, "🐛 Fetching customer reported issues..."
+                )
+                analysis = get_analyzer().get_component_analysis(component)
+                status_update.result()
+
+                status_update = executor.submit(
+                    chatter.emit_message, "🤖 Generating bug summaries with AI..."
+                )
+                blocks = create_view_blocks(
+                    view_type, component, analysis, channel, user
+                )
+                status_update.result()
+
+                chatter.emit_message("📝 Formatting customer bug report...")
+
+            # Send final results through response_url
+            if blocks:
+                post_ephemeral(
+                    response_url, f"Analysis results for {component}:", blocks
+                )
+            else:
+                post_ephemeral(
+                    response_url, f"No {view_type} data found for {component}"
+                )
+
+        except Exception as e:
+            post_ephemeral(response_url, f"❌ Error analyzing {view_type}: {str(e)}")
+
+    Thread(
+        target=process_view_selection,
+        args=(response_url, chatter),
+    ).start()
+
+
+def handle_download(download, component, response_url, channel, user, chatter):
+    """Export the component analysis as a CSV in the background"""
+
+    def process_download(response_url, component, channel):
+        try:
+            download(slack_client, get_analyzer(), component, channel)
+        except Exception as e:
+            post_ephemeral(response_url, "❌ Error downloading CSV: " + str(e))
+
+    export_executor.submit(process_download, response_url, component, channel)
+
+
+# Button action_id prefixes, longest first so "download_bugs" wins over
+# "download". Plain "download" is the impact export of buttons posted before it
+# became "download_impact", which misread components starting with "bugs_".
+ACTION_PATTERN = re.compile(
+    r"^(select_component|view_impact|view_bugs|download_bugs|download_impact"
+    r"|download)_(.+)$"
+)
+ACTION_HANDLERS = {
+    "select_component": handle_component_selection,
+    "view_impact": partial(handle_view_selection, "impact"),
+    "view_bugs": partial(handle_view_selection, "bugs"),
+    "download_bugs": partial(handle_download, download_bugs),
+    "download_impact": partial(handle_download, download_impact_areas),
+    "download": partial(handle_download, download_impact_areas),
+}
 
 
 def process_analysis(component, channel):
     """Process component analysis and send results"""
-    analysis = analyzer.get_component_analysis(component)
+    analysis = get_analyzer().get_component_analysis(component)
     if analysis:
-        blocks_batches = analyzer.format_slack_message(analysis)
+        blocks_batches = get_analyzer().format_slack_message(analysis)
         if blocks_batches:
             for blocks in blocks_batches:
                 slack_client.chat_postMessage(channel=channel, blocks=blocks)
@@ -320,6 +346,21 @@ def process_analysis(component, channel):
 
 def handle_message_event(event):
     """Handle incoming message events"""
+    # Edits arrive wrapping the new message, keyed on the edit's timestamp
+    # so they aren't mistaken for the already processed original. They only
+    # replace a request still being debounced, never start a new analysis.
+    is_edit = event.get("subtype") == "message_changed"
+    if is_edit:
+        message = event.get("message", {})
+        if "edited" not in message:
+            return
+        event = {
+            **message,
+            "channel": event.get("channel"),
+            "channel_type": event.get("channel_type"),
+            "ts": message["edited"].get("ts", event.get("ts")),
+        }
+
     if "bot_id" in event or "text" not in event:
         return
 
@@ -340,22 +381,55 @@ def handle_message_event(event):
 
     # Handle direct messages
     if event.get("channel_type") in ["im", "group"]:
-        if text.lower() in ["hi", "hello", "hey"]:
+        command = text.lower()
+        if command in ["hi", "hello", "hey"]:
             slack_client.chat_postMessage(
                 channel=channel,
                 text="Hey there! 👋 I'm Customer Insights Bot. I can help you analyze customer issues and provide insights. Just tell me which component you'd like to analyze!",
             )
             return
 
-        if text.lower() in ["help", "?"]:
+        if command in ["help", "?"]:
             help_text = """Here's how you can use me:
 • Just type a component name to analyze it
 • Type 'help' to see this message again"""
             slack_client.chat_postMessage(channel=channel, text=help_text)
             return
 
-        # Process the request and return immediately
-        handle_strategy_request(text, channel, user)
+        # Process the request and return immediately, a 1:1 DM is already
+        # private so results can replace the loading message in place
+        debounce_strategy_request(
+            text,
+            channel,
+            user,
+            replace_only=is_edit,
+            ephemeral=event.get("channel_type") != "im",
+        )
+
+
+def debounce_strategy_request(text, channel, user, replace_only=False, **kwargs):
+    """Only analyze the last of several quick messages or edits from a user
+
+    With replace_only the request is dropped unless it replaces one that is
+    still waiting.
+    """
+    key = (channel, user)
+
+    def run():
+        with pending_lock:
+            if pending_requests.get(key) is timer:
+                del pending_requests[key]
+        handle_strategy_request(text, channel, user, **kwargs)
+
+    timer = Timer(DEBOUNCE_SECONDS, run)
+    with pending_lock:
+        previous = pending_requests.get(key)
+        if replace_only and previous is None:
+            return
+        if previous:
+            previous.cancel()
+        pending_requests[key] = timer
+    timer.start()
 
 
 def handle_app_home_opened(event):
@@ -437,7 +511,26 @@ def handle_mention(event):
     handle_strategy_request(text, channel, user)
 
 
-def handle_strategy_request(text, channel, user=None):
+def get_component_index(on_refresh=None):
+    """Return the component search index, rebuilt when the component list changes
+
+    on_refresh is called first when the analyzer has to fetch the component
+    list from JIRA.
+    """
+    jira_analyzer = get_analyzer()
+    if on_refresh and not jira_analyzer.components_cached():
+        on_refresh()
+    # The analyzer returns the same list until it refreshes it
+    components = jira_analyzer.get_available_components()
+    if components is not components_cache["components"]:
+        components_cache["index"] = [
+            (comp, comp.lower(), comp.lower().split()) for comp in sorted(set(components))
+        ]
+        components_cache["components"] = components
+    return components_cache["index"]
+
+
+def handle_strategy_request(text, channel, user=None, ephemeral=True):
     """Handle component analysis requests"""
     try:
         if not text:
@@ -452,69 +545,41 @@ def handle_strategy_request(text, channel, user=None):
         if "<@" in search_term:
             search_term = search_term.split(">", 1)[-1].strip()
 
-        # Update loading message while checking cache
-        slack_client.chat_update(
-            channel=channel,
-            ts=loading_msg["ts"],
-            text="🔍 Analyzing available components...",
-        )
-
-        # Use cached components first for quick response
-        global cached_components
-        if not cached_components:
-            slack_client.chat_update(
+        # Use cached components first for quick response, only the slow
+        # refresh from JIRA is worth a status update
+        component_index = get_component_index(
+            on_refresh=lambda: slack_client.chat_update(
                 channel=channel,
                 ts=loading_msg["ts"],
                 text="🔄 Refreshing component list from JIRA...",
             )
-            cached_components = set(analyzer.get_available_components())
-
-        # Update message while matching components
-        slack_client.chat_update(
-            channel=channel,
-            ts=loading_msg["ts"],
-            text="🎯 Finding matches for your request...",
         )
 
         # Enhanced wildcard matching for components
-        matching_components = set()
-        search_words = search_term.lower().split()
-        for comp in cached_components:
-            comp_lower = comp.lower()
-            comp_words = comp_lower.split()
-
+        matching_components = []
+        search_words = search_term.split()
+        for comp, comp_lower, comp_words in component_index:
             # Match if:
-            # 1. Search term appears anywhere in component name
-            # 2. Component name contains any search word
-            # 3. Any word in component starts with search term
-            # 4. Search term starts with any word in component
+            # 1. Search word appears anywhere in component name, which also
+            #    covers a component word starting with or containing it
+            # 2. Component name is part of the search word
+            # 3. Search word starts with any word in component
             if any(
-                sw in comp_lower  # Full word match
+                sw in comp_lower  # Full, prefix or partial word match
                 or comp_lower in sw  # Component is part of search word
-                or any(
-                    word.startswith(sw) or sw.startswith(word) for word in comp_words
-                )  # Prefix match
-                or any(sw in word for word in comp_words)  # Partial word match
+                or any(sw.startswith(word) for word in comp_words)  # Prefix match
                 for sw in search_words
             ):
-                matching_components.add(comp)
-
-        matching_components = sorted(matching_components)
-
-        # Delete the loading message
-        slack_client.chat_delete(channel=channel, ts=loading_msg["ts"])
+                matching_components.append(comp)
 
         if not matching_components:
-            if user:
-                slack_client.chat_postEphemeral(
-                    channel=channel,
-                    user=user,
-                    text=f"❌ No components found matching: '{text}'",
-                )
-            else:
-                slack_client.chat_postMessage(
-                    channel=channel, text=f"❌ No components found matching: '{text}'"
-                )
+            replace_loading_message(
+                channel,
+                loading_msg["ts"],
+                user,
+                ephemeral,
+                text=f"❌ No components found matching: '{text}'",
+            )
             return
 
         # Create a single message with all matching components
@@ -541,29 +606,17 @@ def handle_strategy_request(text, channel, user=None):
         ]
 
         # Send a single message and return immediately
-        if user:
-            slack_client.chat_postEphemeral(
-                channel=channel,
-                user=user,
-                blocks=blocks,
-                text="Found matching components",  # Fallback text
-            )
-        else:
-            slack_client.chat_postMessage(
-                channel=channel,
-                blocks=blocks,
-                text="Found matching components",  # Fallback text
-            )
+        replace_loading_message(
+            channel,
+            loading_msg["ts"],
+            user,
+            ephemeral,
+            blocks=blocks,
+            text="Found matching components",  # Fallback text
+        )
 
     except Exception as e:
-        if user:
-            slack_client.chat_postEphemeral(
-                channel=channel, user=user, text=f"Sorry, I encountered an error: {e}"
-            )
-        else:
-            slack_client.chat_postMessage(
-                channel=channel, text=f"Sorry, I encountered an error: {e}"
-            )
+        reply(channel, user, text=f"Sorry, I encountered an error: {e}")
 
 
 def create_view_blocks(view_type, component, analysis, channel, user=None):
@@ -583,37 +636,15 @@ def create_view_blocks(view_type, component, analysis, channel, user=None):
 
     if view_type == "impact":
         try:
-            # Extract impacts by class
-            impacts_by_class = {"Class 1": [], "Class 2": [], "Class 3": []}
+            # Extract impacts by class, using dict keys as an ordered set
+            impacts_by_class = {class_name: {} for class_name in PRIORITY_CLASSES}
 
             # First collect all impacts by class
-            for customer, priority_flows in analysis.items():
-                for priority, flows in priority_flows.items():
-                    for flow in flows:
-                        if "*Impact:*" in flow:
-                            impact = flow.split("*Impact:*")[1]
-                            if "*Fix:*" in impact:
-                                impact = impact.split("*Fix:*")[0]
-                            if "*Test:*" in impact:
-                                impact = impact.split("*Test:*")[0]
-                            impact = impact.strip()
-
-                            # Add to appropriate class based on priority
-                            if (
-                                priority == "Class 1"
-                                and impact not in impacts_by_class["Class 1"]
-                            ):
-                                impacts_by_class["Class 1"].append(impact)
-                            elif (
-                                priority == "Class 2"
-                                and impact not in impacts_by_class["Class 2"]
-                            ):
-                                impacts_by_class["Class 2"].append(impact)
-                            elif (
-                                priority == "Class 3"
-                                and impact not in impacts_by_class["Class 3"]
-                            ):
-                                impacts_by_class["Class 3"].append(impact)
+            for flow in iter_parsed_flows(analysis):
+                if flow.impact in ("", NO_DESCRIPTION_IMPACT):
+                    continue
+                if flow.priority in impacts_by_class:
+                    impacts_by_class[flow.priority][flow.impact] = None
 
             # Create blocks with proper structure
             blocks = [
@@ -693,7 +724,7 @@ def create_view_blocks(view_type, component, analysis, channel, user=None):
                                     "text": "📥 Download CSV",
                                     "emoji": True,
                                 },
-                                "action_id": f"download_{component}",
+                                "action_id": f"download_impact_{component}",
                             }
                         ],
                     }
@@ -721,7 +752,7 @@ def create_view_blocks(view_type, component, analysis, channel, user=None):
 
     elif view_type == "bugs":
         # Get all blocks for bugs view
-        blocks_batches = analyzer.format_slack_message(analysis)
+        blocks_batches = get_analyzer().format_slack_message(analysis)
         if blocks_batches:
             # Send all batches except the last one
             for i, blocks in enumerate(blocks_batches[:-1]):
@@ -812,5 +843,7 @@ def get_analysis_options_blocks(component):
 
 
 if __name__ == "__main__":
+    # Connect to JIRA up front so the first Slack request doesn't pay for it
+    get_analyzer()
     port = int(os.environ.get("PORT", 8000))
     app.run(host="0.0.0.0", port=port)
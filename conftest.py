@@ -0,0 +1,32 @@
+import pytest
+
+
+class FakeClock:
+    """Stands in for the time module, sleeping advances the clock instantly"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def fake_time(monkeypatch):
+    """Replace the time module of the given modules with one FakeClock"""
+    clock = FakeClock()
+
+    def install(*modules):
+        for module in modules:
+            monkeypatch.setattr(module, "time", clock)
+        return clock
+
+    return install
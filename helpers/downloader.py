@@ -1,13 +1,10 @@
+import csv
+import io
 from datetime import datetime
 from flask import jsonify
 import logging
+from helpers.parse import NO_DESCRIPTION_IMPACT, iter_parsed_flows
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.FileHandler("bot.log"), logging.StreamHandler()],
-)
 logger = logging.getLogger(__name__)
 
 
@@ -16,50 +13,23 @@ def download_bugs(slack_client, analyzer, component, channel):
         channel=channel, text="🔄 Starting bugs CSV export..."
     )
     try:
-        slack_client.chat_update(
-            channel=channel, ts=loading_msg["ts"], text="📊 Analyzing customer bugs..."
-        )
         analysis = analyzer.get_component_analysis(component)
-        slack_client.chat_update(
-            channel=channel,
-            ts=loading_msg["ts"],
-            text="📝 Formatting bug data for export...",
-        )
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         filename = f"customer_bugs_{component}_{timestamp}.csv"
-        csv_content = (
-            '"Number","Component","Customer","Priority","Impact","Fix","Test"\n'
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC, lineterminator="\n")
+        writer.writerow(
+            ["Number", "Component", "Customer", "Priority", "Impact", "Fix", "Test"]
         )
-        row_number = 1
-        for customer, priorities in analysis.items():
-            for priority, flows in priorities.items():
-                for flow in flows:
-                    impact = ""
-                    fix = ""
-                    test = ""
-                    if "*Impact:*" in flow:
-                        parts = flow.split("*Impact:*", 1)
-                        impact_part = parts[1]
-                        if "*Fix:*" in impact_part:
-                            impact = impact_part.split("*Fix:*")[0].strip()
-                        if "*Fix:*" in flow:
-                            fix_part = flow.split("*Fix:*", 1)[1]
-                            if "*Test:*" in fix_part:
-                                fix = fix_part.split("*Test:*")[0].strip()
-                                test = flow.split("*Test:*")[1].strip()
-                            else:
-                                fix = fix_part.strip()
-                    safe_impact = impact.replace('"', '""')
-                    safe_fix = fix.replace('"', '""')
-                    safe_test = test.replace('"', '""')
-                    safe_customer = customer.replace('"', '""')
-                    csv_content += f'{row_number},"{component}","{safe_customer}","{priority}","{safe_impact}","{safe_fix}","{safe_test}"\n'
-                    row_number += 1
-        slack_client.chat_update(
-            channel=channel, ts=loading_msg["ts"], text="📤 Uploading CSV file..."
+        writer.writerows(
+            [row_number, component, *flow]
+            for row_number, flow in enumerate(iter_parsed_flows(analysis), 1)
         )
+        csv_content = buffer.getvalue()
         logger.debug(
-            f"Uploading CSV file: filename: {filename}, CSV content length: {len(csv_content)}"
+            "Uploading CSV file: filename: %s, CSV content length: %d",
+            filename,
+            len(csv_content),
         )
         response = slack_client.files_upload_v2(
             content=csv_content,
@@ -71,7 +41,7 @@ def download_bugs(slack_client, analyzer, component, channel):
         slack_client.chat_delete(channel=channel, ts=loading_msg["ts"])
         return response
     except Exception as e:
-        logger.error(f"Error downloading bugs CSV: {e}")
+        logger.error("Error downloading bugs CSV: %s", e)
         slack_client.chat_update(
             channel=channel,
             ts=loading_msg["ts"],
@@ -85,42 +55,25 @@ def download_impact_areas(slack_client, analyzer, component, channel):
         channel=channel, text="🔄 Starting CSV export process..."
     )
     try:
-        slack_client.chat_update(
-            channel=channel,
-            ts=loading_msg["ts"],
-            text="📊 Analyzing component data...",
-        )
         analysis = analyzer.get_component_analysis(component)
-        impacts = []
-        for customer, priority_flows in analysis.items():
-            for priority, flows in priority_flows.items():
-                for flow in flows:
-                    if "*Impact:*" in flow:
-                        impact = flow.split("*Impact:*", 1)[1]
-                        if "*Fix:*" in impact:
-                            impact = impact.split("*Fix:*")[0]
-                        if "*Test:*" in impact:
-                            impact = impact.split("*Test:*")[0]
-                        impact = impact.strip()
-                        if impact and impact not in impacts:
-                            impacts.append(impact)
-        slack_client.chat_update(
-            channel=channel,
-            ts=loading_msg["ts"],
-            text="📝 Formatting data for export...",
+        # Ordered, de-duplicated impacts via dict keys
+        impacts = dict.fromkeys(
+            flow.impact
+            for flow in iter_parsed_flows(analysis)
+            if flow.impact not in ("", NO_DESCRIPTION_IMPACT)
         )
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         filename = f"impact_areas_{component}_{timestamp}.csv"
-        csv_content = '"Impact Area"\n'
-        for impact in impacts:
-            safe_impact = impact.replace('"', '""')
-            csv_content += f'"{safe_impact}"\n'
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, quoting=csv.QUOTE_ALL, lineterminator="\n")
+        writer.writerow(["Impact Area"])
+        writer.writerows([impact] for impact in impacts)
+        csv_content = buffer.getvalue()
 
-        slack_client.chat_update(
-            channel=channel, ts=loading_msg["ts"], text="📤 Uploading CSV file..."
-        )
         logger.info(
-            f"Uploading CSV file: filename: {filename}, CSV content length: {len(csv_content)}"
+            "Uploading CSV file: filename: %s, CSV content length: %d",
+            filename,
+            len(csv_content),
         )
         response = slack_client.files_upload_v2(
             content=csv_content,
@@ -132,7 +85,7 @@ def download_impact_areas(slack_client, analyzer, component, channel):
         slack_client.chat_delete(channel=channel, ts=loading_msg["ts"])
         return response
     except Exception as e:
-        logger.error(f"Error downloading CSV: {e}")
+        logger.error("Error downloading CSV: %s", e)
         slack_client.chat_update(
             channel=channel,
             ts=loading_msg["ts"],
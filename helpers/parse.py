@@ -0,0 +1,64 @@
+import json
+import re
+from collections import namedtuple
+
+# Splits a GPT summary into its Impact/Fix/Test sections in a single scan
+FLOW_SECTIONS = re.compile(
+    r"\*Impact:\*(?P<impact>.*?)"
+    r"(?:\*Fix:\*(?P<fix>.*?))?"
+    r"(?:\*Test:\*(?P<test>.*?))?\Z",
+    re.DOTALL,
+)
+
+# Impact of the placeholder summary given to bugs without any details, which
+# isn't a real impact area
+NO_DESCRIPTION_IMPACT = "(no description provided)"
+
+ParsedFlow = namedtuple("ParsedFlow", "customer priority impact fix test")
+
+
+def parse_flow_sections(flow):
+    """Return the (impact, fix, test) text of a flow, empty when missing"""
+    match = FLOW_SECTIONS.search(flow)
+    if not match:
+        return "", "", ""
+    return tuple((section or "").strip() for section in match.groups())
+
+
+def parse_batch_summaries(reply, keys):
+    """Impact/Fix/Test summaries by issue key from a JSON batch reply
+
+    Entries for unknown or repeated keys, or with an empty section, are left
+    out so their issues can be summarized on their own. Raises ValueError
+    when the reply isn't a JSON object with a list of summaries.
+    """
+    try:
+        items = json.loads(reply)["summaries"]
+    except (TypeError, KeyError) as e:
+        raise ValueError(f"not a batch reply: {e!r}") from e
+    if not isinstance(items, list):
+        raise ValueError("summaries is not a list")
+
+    summaries = {}
+    repeated = set()
+    for item in items:
+        if not isinstance(item, dict) or item.get("key") not in keys:
+            continue
+        sections = [item.get(section) for section in ("impact", "fix", "test")]
+        if not all(isinstance(s, str) and s.strip() for s in sections):
+            continue
+        if item["key"] in summaries:
+            repeated.add(item["key"])
+        summaries[item["key"]] = "Impact: {}\nFix: {}\nTest: {}".format(*sections)
+    # A key summarized twice can't be trusted either way
+    for key in repeated:
+        del summaries[key]
+    return summaries
+
+
+def iter_parsed_flows(analysis):
+    """Yield a ParsedFlow for every summary in a component analysis"""
+    for customer, priorities in analysis.items():
+        for priority, flows in priorities.items():
+            for flow in flows:
+                yield ParsedFlow(customer, priority, *parse_flow_sections(flow))
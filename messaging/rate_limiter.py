@@ -0,0 +1,53 @@
+import time
+from threading import Lock
+
+from slack_sdk import WebClient
+from slack_sdk.http_retry.builtin_handlers import RateLimitErrorRetryHandler
+
+
+class TokenBucket:
+    """Thread-safe token bucket that blocks callers until a token is free"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = Lock()
+
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            # Reserve a token now so concurrent callers queue up behind us
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+class RateLimitedWebClient(WebClient):
+    """WebClient that paces each Slack API method and retries on HTTP 429
+
+    Slack rate limits per method, so every method gets its own bucket. Calls
+    that still get a 429 wait for the Retry-After header and are retried.
+    """
+
+    def __init__(self, *args, rate=1.0, burst=5, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rate = rate
+        self.burst = burst
+        self.buckets = {}
+        self.buckets_lock = Lock()
+        self.retry_handlers.append(RateLimitErrorRetryHandler(max_retry_count=3))
+
+    def api_call(self, api_method, **kwargs):
+        with self.buckets_lock:
+            bucket = self.buckets.get(api_method)
+            if bucket is None:
+                bucket = self.buckets[api_method] = TokenBucket(self.rate, self.burst)
+        bucket.acquire()
+        return super().api_call(api_method, **kwargs)
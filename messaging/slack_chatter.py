@@ -2,6 +2,13 @@ import requests
 
 from slack_sdk import WebClient
 
+# Shared keep-alive session so response_url posts reuse pooled connections
+# to Slack instead of a new TCP and TLS handshake each time
+http_session = requests.Session()
+
+# Seconds to wait on a response_url post
+RESPONSE_URL_TIMEOUT = 10
+
 
 class SlackChatter:
     def __init__(self, slack_client, slack_channel, ts=None, response_url=None):
@@ -23,7 +30,7 @@ class SlackChatter:
                 blocks=blocks,
             )
         elif self.response_url:
-            return requests.post(
+            return http_session.post(
                 self.response_url,
                 json={
                     "text": text,
@@ -31,6 +38,7 @@ class SlackChatter:
                     "response_type": "ephemeral",
                     "blocks": blocks,
                 },
+                timeout=RESPONSE_URL_TIMEOUT,
             )
         return self.slack_client.chat_postMessage(
             channel=self.slack_channel, text=text, blocks=blocks
@@ -1,24 +1,206 @@
 from jira import JIRA
+from jira.exceptions import JIRAError
 from datetime import datetime
 import re
 import openai
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
+from urllib3.util.retry import Retry
 import concurrent.futures
+import contextlib
+import hashlib
+import itertools
+import json
 import logging
+import math
+import os
 import time
+from threading import Lock
+from collections import namedtuple
+from services.openai_throttler import AIMDController, RequestThrottler, retry_delay
+from services.summary_cache import SummaryCache
+from helpers.parse import NO_DESCRIPTION_IMPACT, parse_batch_summaries
 
 logger = logging.getLogger(__name__)
 
+# Max pooled connections to JIRA
+HTTP_POOL_SIZE = 32
+
+# Slack rejects messages with more blocks than this
+SLACK_MAX_BLOCKS = 50
+
+# Shared by every analysis message, blocks are never modified after building
+SLACK_DIVIDER = {"type": "divider"}
+
+# GPT errors worth retrying, with backoff
+OPENAI_TRANSIENT_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+OPENAI_MAX_ATTEMPTS = 5
+
+OPENAI_MODEL = "gpt-4o-mini"
+
+# Issues summarized per GPT request
+SUMMARY_BATCH_SIZE = 12
+
+# Bump when the summary prompts change so cached summaries are regenerated
+SUMMARY_PROMPT_VERSION = 2
+
+# Reply budget for one Impact/Fix/Test summary
+SUMMARY_MAX_TOKENS = 180
+
+# Rough size of a GPT token, used for budgets without a tokenizer
+CHARS_PER_TOKEN = 4
+
+# Bug info sent to GPT as (label, field, token budget)
+BUG_INFO_FIELDS = (
+    ("Summary", "summary", 100),
+    ("Description", "description", 400),
+    ("Root Cause", "customfield_11554", 200),
+    ("Resolution", "customfield_11596", 200),
+)
+
+# Summary used for bugs with neither a description nor a root cause, which
+# leave GPT nothing to summarize
+NO_DETAILS_SUMMARY = f"Impact: {NO_DESCRIPTION_IMPACT}\nFix: n/a\nTest: n/a"
+
+# Issues requested per search page. JIRA Cloud caps pages at 100 while
+# Data Center allows up to 1000, so JIRA_PAGE_SIZE can raise it there.
+JIRA_PAGE_SIZE = 100
+
+# Search pages fetched at once
+JIRA_SEARCH_CONCURRENCY = 8
+
+# Issue fields read when summarizing, everything else is left on the server
+ISSUE_FIELDS = [
+    "summary",
+    "description",
+    "components",
+    "priority",
+    "customfield_11554",  # Root cause
+    "customfield_11596",  # Resolution
+    "customfield_11602",  # Customer
+]
+
+# JIRA priority classes, most severe first
+PRIORITY_CLASSES = ("Class 1", "Class 2", "Class 3")
+PRIORITY_EMOJI = {"Class 1": "🔴", "Class 2": "🟧", "Class 3": "🟡"}
+
+# Section labels in GPT replies, bolded onto their own line
+GPT_SECTION_LABELS = re.compile(r"Impact:|Fix:|Test:")
+
+# Bold labels in summaries and their Slack code block headings
+SLACK_SECTION_LABELS = {"*Impact:*": "*IMPACT*", "*Fix:*": "*FIX*", "*Test:*": "*TEST*"}
+SLACK_SECTION_PATTERN = re.compile("|".join(map(re.escape, SLACK_SECTION_LABELS)))
+
+# Numbered steps or bullet points in free text
+STEP_SEPARATORS = re.compile(r"\d+\.|•|\*|\n-")
+
+# Words marking cause-effect and requirement-style sentences, matched as
+# whole words so "if" doesn't match inside "specifically"
+CAUSE_WORDS = re.compile(r"\b(?:when|if|because|due to)\b", re.IGNORECASE)
+REQUIREMENT_WORDS = re.compile(r"\b(?:should|must|needs to|expected)\b", re.IGNORECASE)
+
+
+class EmptyCompletionError(openai.OpenAIError):
+    """GPT finished without any content, e.g. when a content filter tripped"""
+
+
+def truncate(text, max_tokens):
+    """Cut text down to roughly max_tokens, marking where it was cut"""
+    text = str(text or "")
+    limit = max_tokens * CHARS_PER_TOKEN
+    return text if len(text) <= limit else text[:limit] + "…"
+
+
+def describe_bug(fields):
+    """Bug info for a GPT prompt, empty fields left out rather than sent blank"""
+    return "\n".join(
+        f"{label}: {truncate(fields[field], max_tokens)}"
+        for label, field, max_tokens in BUG_INFO_FIELDS
+        if fields.get(field)
+    )
+
+
+def has_details(fields):
+    """Whether a bug has a description or root cause worth summarizing"""
+    description = fields.get("description") or ""
+    return bool(description.strip() or fields.get("customfield_11554"))
+
+
+def summary_key(issue):
+    """Summary cache key for an issue
+
+    Keyed on the bug info sent to GPT alone, so edits that don't touch it,
+    like comments and transitions, still hit the cache, and duplicate
+    filings of the same bug share one summary.
+    """
+    bug = describe_bug(issue["fields"]).encode()
+    digest = hashlib.sha256(bug).hexdigest()
+    return f"{OPENAI_MODEL}:{SUMMARY_PROMPT_VERSION}:{digest}"
+
+
+IssueRow = namedtuple(
+    "IssueRow",
+    "key summary components components_lower customer description gpt_summary"
+    " priority_class",
+)
+
+
+def extract_row(issue, gpt_summary, priority_class):
+    """Analysis row for an issue and its formatted summary"""
+    fields = issue["fields"]
+    # The customer field can be a list or a single option
+    customer = fields.get("customfield_11602")
+    if isinstance(customer, list):
+        customer = customer[0] if customer else None
+    components = [c["name"] for c in fields.get("components") or () if c.get("name")]
+    return IssueRow(
+        key=issue["key"],
+        summary=fields.get("summary", ""),
+        components=components,
+        # Precomputed for case-insensitive component matching
+        components_lower=frozenset(c.lower() for c in components),
+        customer=customer.get("value") if isinstance(customer, dict) else None,
+        description=fields.get("description"),
+        gpt_summary=gpt_summary,
+        priority_class=priority_class,
+    )
+
+
+def group_flows(rows, component_name):
+    """GPT summaries of a component's rows, by customer and priority class"""
+    component_lower = component_name.lower()
+    customer_flows = {}
+    for row in rows:
+        customer = row.customer
+        if not customer or component_lower not in row.components_lower:
+            continue
+
+        if customer not in customer_flows:
+            customer_flows[customer] = {priority: [] for priority in PRIORITY_CLASSES}
+
+        # Add the GPT summary to the appropriate priority list
+        if row.priority_class and row.gpt_summary:
+            customer_flows[customer][row.priority_class].append(row.gpt_summary)
+    return customer_flows
+
 
 class JiraAnalyzer:
-    def __init__(self, jira_config):
+    def __init__(self, jira_config, openai_client=None):
 
         self.max_retries = 3
         self.timeout = 30  # 30 seconds timeout
+        self.jira_page_size = int(os.environ.get("JIRA_PAGE_SIZE", JIRA_PAGE_SIZE))
         try:
             self.jira = JIRA(
                 server=jira_config["server"],
                 basic_auth=(jira_config["email"], jira_config["api_token"]),
-                validate=True,
+                # myself() below checks the credentials, no need to do it twice
+                validate=False,
                 options={
                     "verify": True,
                     "headers": {"Accept": "application/json"},
@@ -26,195 +208,369 @@ class JiraAnalyzer:
                 },
             )
 
+            # Size the connection pool for concurrent requests instead of
+            # queueing on the requests default of 10, and retry dropped
+            # connections. JIRA's own session already retries 429/5xx responses.
+            adapter = HTTPAdapter(
+                pool_connections=HTTP_POOL_SIZE,
+                pool_maxsize=HTTP_POOL_SIZE,
+                max_retries=Retry(
+                    connect=3,
+                    read=2,
+                    status=0,
+                    backoff_factor=0.5,
+                    allowed_methods=frozenset({"GET"}),
+                ),
+            )
+            self.jira._session.mount("https://", adapter)
+            self.jira._session.mount("http://", adapter)
+            self.browse_url = f"{self.jira._options['server']}/browse"
+
             # Test connection
             myself = self.jira.myself()
-            print(f"Successfully connected as: {myself['displayName']}")
-
-            # Get project info
-            projects = self.jira.projects()
-            print("\nAvailable projects:")
-            for project in projects:
-                print(f"Project: {project.key} - {project.name}")
+            logger.info("Successfully connected as: %s", myself["displayName"])
 
-            # Get issue
-            issue_types = self.jira.issue_types()
-            print("\nAvailable issue types:")
-            for issue_type in issue_types:
-                print(f"Type: {issue_type.name} (id: {issue_type.id})")
+            # Listing projects and issue types costs two extra round trips,
+            # so only do it when debugging
+            if logger.isEnabledFor(logging.DEBUG):
+                for project in self.jira.projects():
+                    logger.debug("Project: %s - %s", project.key, project.name)
+                for issue_type in self.jira.issue_types():
+                    logger.debug("Type: %s (id: %s)", issue_type.name, issue_type.id)
 
         except Exception as e:
-            print(f"Failed to connect to Jira: {str(e)}")
+            logger.error("Failed to connect to Jira: %s", e)
             if hasattr(e, "response"):
-                print(f"Response status: {e.response.status_code}")
-                print(f"Response body: {e.response.text}")
+                logger.error("Response status: %s", e.response.status_code)
+                logger.error("Response body: %s", e.response.text)
             raise
 
-        self.openai_client = openai.OpenAI()
-
-        # Fields we want to analyze
-        self.fields_to_analyze = [
-            "summary",
-            "components",
-            "customfield_11602",  # Customer field
-            "description",
-            "gpt_summary",  # Add new field
-        ]
+        # Retries are handled by complete() so the AIMD controller sees every
+        # rate limit instead of the SDK silently retrying them
+        self.openai_client = (openai_client or openai.OpenAI()).with_options(
+            max_retries=0
+        )
+
+        # Bound the summary fan-out and keep it within the account's limits
+        self.openai_concurrency = int(os.environ.get("OPENAI_CONCURRENCY", 20))
+        self.openai_aimd = AIMDController(
+            start=max(1, self.openai_concurrency // 2),
+            maximum=self.openai_concurrency,
+        )
+        self.openai_throttler = RequestThrottler(
+            rpm=int(os.environ.get("OPENAI_RPM", 500)),
+            tpm=int(os.environ.get("OPENAI_TPM", 200000)),
+        )
+
+        # Summaries of unchanged issues are reused across runs
+        self.summary_cache = SummaryCache(
+            os.environ.get("SUMMARY_CACHE_PATH", ".cache/gpt_summaries.sqlite3")
+        )
 
         # Cache for component data
         self.component_cache = {}
         self.last_refresh = None
+        self.component_lock = Lock()
         self.CACHE_DURATION = 3600  # 1 hour in seconds
+        self.analysis_cache = {}  # lowercased component -> (timestamp, analysis)
+        self.analysis_locks = {}  # lowercased component -> Lock for its build
+        self.analysis_locks_lock = Lock()
+        self.ANALYSIS_CACHE_DURATION = 300  # 5 minutes in seconds
         self.platform_filter = None  # Initialize platform filter
 
+    def close(self):
+        """Close the pooled JIRA connections and the summary cache"""
+        self.jira.close()
+        self.summary_cache.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
     ####
     # We're missing data in the issues, specifically the Customer field is a Date.
     # Need to figure out how to get the right data out of the Issue.
     ####
-    def process_production_issues(self, component_name):
-        """Process production issues for a component"""
+    def process_production_issues(self, component_names, use_cache=True):
+        """Process production issues for a component or list of components
+
+        Several components share one search, so a bug tagged with more than
+        one of them is summarized once. GPT summaries are cached per bug
+        info. Pass use_cache=False to summarize every issue again.
+        """
+        if isinstance(component_names, str):
+            component_names = [component_names]
         try:
-            # First, verify the component exists and get its exact name
-            all_components = self.get_available_components()
-            matching_component = next(
-                (c for c in all_components if c.lower() == component_name.lower()), None
+            # First, verify the components exist and get their exact names
+            self.get_available_components()
+            lower_to_canonical = self.component_cache["lower_to_canonical"]
+            components = ", ".join(
+                f'"{lower_to_canonical.get(name.lower(), name)}"'
+                for name in component_names
             )
 
-            if matching_component:
-                component_name = matching_component
-
             # Construct JQL query with less restrictions
             jql = f"""
                 type in (Bug, "Production Issue", Defect)
-                AND component = "{component_name}"
+                AND component in ({components})
                 ORDER BY created DESC
             """
-            # Search for issues
-            issues = self.jira.search_issues(jql)
-            total_issues = len(issues) if issues else 0
-            if total_issues > 0:
-                first_issue = issues[0]
-
-            else:
-                return []
-
-            # Initialize data list before using it
-            data = []
-
-            def summarize_issue(issue):
-                prompt = f"""
-                Provide a bug summary with each section on a new line in format:
-                Impact: [customer impact]
-                Fix: [solution]
-                Test: [key test scenario]
-
-                Bug info: 
-                Summary: {getattr(issue.fields, 'summary', '')}
-                Description: {getattr(issue.fields, 'description', '')}
-                Root Cause: {getattr(issue.fields, 'customfield_11554', '')}
-                Resolution: {getattr(issue.fields, 'customfield_11596', '')}
-                """
-                title_link = f"*{getattr(issue.fields, 'summary', '')}*\n<{self.jira._options['server']}/browse/{issue.key}|View in Jira>"
-                try:
-                    r = self.openai_client.chat.completions.create(
-                        model="gpt-4o-mini",
-                        messages=[{"role": "user", "content": prompt}],
-                        max_tokens=300,
-                        temperature=0.7,
-                    )
-                    gpt_text = r.choices[0].message.content.strip()
-                    # Add line breaks between sections and make labels bold
-                    gpt_text = gpt_text.replace("Impact:", "\n*Impact:*")
-                    gpt_text = gpt_text.replace("Fix:", "\n*Fix:*")
-                    gpt_text = gpt_text.replace("Test:", "\n*Test:*")
-
-                    # Add priority information with appropriate emoji
-                    priority = getattr(issue.fields, "priority", None)
-                    priority_text = ""
-                    if priority:
-                        if "Class 1" in priority.name:
-                            priority_text = "🔴 *Class 1*"
-                        elif "Class 2" in priority.name:
-                            priority_text = "🟧 *Class 2*"
-                        elif "Class 3" in priority.name:
-                            priority_text = "🟡 *Class 3*"
-
-                    title_link = f"*{getattr(issue.fields, 'summary', '')}*\n<{self.jira._options['server']}/browse/{issue.key}|View in Jira>"
-                    if priority_text:
-                        title_link = f"{priority_text} | {title_link}"
-
-                    final_gpt_summary = (
-                        f"{title_link}\n{gpt_text}\n"  # Added extra newline at end
-                    )
-                    
-                    # Safely handle customer field which could be a list or single value
-                    customer_field = getattr(issue.fields, "customfield_11602", None)
-                    customer_value = None
-                    if customer_field:
-                        if isinstance(customer_field, list) and len(customer_field) > 0:
-                            customer_value = customer_field[0].value
-                        elif hasattr(customer_field, 'value'):
-                            customer_value = customer_field.value
-                        
-                    return (
-                        issue.key,
-                        getattr(issue.fields, "summary", ""),
-                        [
-                            c.name
-                            for c in getattr(issue.fields, "components", [])
-                            if hasattr(c, "name")
-                        ],
-                        customer_value,
-                        getattr(issue.fields, "description", None),
-                        final_gpt_summary,
-                    )
-                except:
-                    final_gpt_summary = f"{title_link}\n"
-                    
-                    # Safely handle customer field which could be a list or single value
-                    customer_field = getattr(issue.fields, "customfield_11602", None)
-                    customer_value = None
-                    if customer_field:
-                        if isinstance(customer_field, list) and len(customer_field) > 0:
-                            customer_value = customer_field[0].value
-                        elif hasattr(customer_field, 'value'):
-                            customer_value = customer_field.value
-                            
-                    return (
-                        issue.key,
-                        getattr(issue.fields, "summary", ""),
-                        [
-                            c.name
-                            for c in getattr(issue.fields, "components", [])
-                            if hasattr(c, "name")
-                        ],
-                        customer_value,
-                        getattr(issue.fields, "description", None),
-                        final_gpt_summary,
-                    )
 
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                results = list(executor.map(summarize_issue, issues))
+            issues = []
+            positions = {}
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.openai_concurrency
+            ) as executor:
+                issue_futures = {}
+                batch_futures = {}
+                # Issues waiting on a GPT summary, by summary key
+                waiting = {}
+
+                def submit_batch(batch):
+                    batch_futures[executor.submit(self.summarize_batch, batch)] = batch
+
+                # Summarize each page while the next ones are still downloading
+                pending = []
+                for page in self.iter_issue_pages(jql):
+                    for issue in page:
+                        # Issues created mid-search shift later pages
+                        if issue["key"] in positions:
+                            continue
+                        positions[issue["key"]] = len(issues)
+                        issues.append(issue)
+                        key = summary_key(issue)
+                        if not has_details(issue["fields"]):
+                            gpt_text = NO_DETAILS_SUMMARY
+                        else:
+                            gpt_text = (
+                                self.summary_cache.get(key) if use_cache else None
+                            )
+                        if gpt_text is not None:
+                            summary_future = executor.submit(
+                                self.summarize_twins, [issue], gpt_text
+                            )
+                            issue_futures[summary_future] = [issue]
+                        elif key in waiting:
+                            # Same bug info as an issue already queued for GPT
+                            waiting[key].append(issue)
+                        else:
+                            waiting[key] = [issue]
+                            pending.append(issue)
+                    while len(pending) >= SUMMARY_BATCH_SIZE:
+                        submit_batch(pending[:SUMMARY_BATCH_SIZE])
+                        pending = pending[SUMMARY_BATCH_SIZE:]
+                if pending:
+                    submit_batch(pending)
+
+                # Format each batch as soon as it lands; issues its reply didn't
+                # cover fall back to one GPT call per distinct bug
+                for future in concurrent.futures.as_completed(batch_futures):
+                    batch_summaries = future.result()
+                    for issue in batch_futures[future]:
+                        twins = waiting[summary_key(issue)]
+                        summary_future = executor.submit(
+                            self.summarize_twins,
+                            twins,
+                            batch_summaries.get(issue["key"]),
+                        )
+                        issue_futures[summary_future] = twins
 
-            for key, summary, components, customer, desc, gpt_summary in results:
-                data.append(
-                    {
-                        "key": key,
-                        "summary": summary,
-                        "components": components,
-                        "customer": customer,
-                        "description": desc,
-                        "gpt_summary": gpt_summary,
-                    }
-                )
+                # Rows are collected as they complete and kept in search order
+                data = [None] * len(issues)
+                for future in concurrent.futures.as_completed(issue_futures):
+                    for issue, row in zip(issue_futures[future], future.result()):
+                        data[positions[issue["key"]]] = row
 
             return data
 
         except Exception as e:
             if hasattr(e, "response"):
-                print(f"Response status: {e.response.status_code}")
-                print(f"Response body: {e.response.text}")
+                logger.error("Response status: %s", e.response.status_code)
+                logger.error("Response body: %s", e.response.text)
             raise
 
+    def summarize_batch(self, batch):
+        """Summarize several issues with one GPT call, keyed by issue
+
+        GPT echoes each issue key back with its summary. Issues the reply
+        leaves out or summarizes badly are left for a per-issue GPT call.
+        """
+        bugs = "\n\n".join(
+            f"Bug {issue['key']}:\n{describe_bug(issue['fields'])}" for issue in batch
+        )
+        prompt = f"""
+        Summarize each bug below. Reply with a JSON object of the form
+        {{"summaries": [{{"key": "<bug key>", "impact": "[customer impact]",
+        "fix": "[solution]", "test": "[key test scenario]"}}]}}
+
+        {bugs}
+        """
+        try:
+            reply = self.complete(
+                prompt,
+                max_tokens=SUMMARY_MAX_TOKENS * len(batch),
+                response_format={"type": "json_object"},
+            )
+            summaries = parse_batch_summaries(reply, [i["key"] for i in batch])
+        except (openai.OpenAIError, ValueError) as e:
+            logger.warning("Batch summary failed (%s), retrying per issue", e)
+            return {}
+
+        if len(summaries) < len(batch):
+            logger.warning(
+                "Batch reply covered %d of %d issues, retrying the rest per issue",
+                len(summaries),
+                len(batch),
+            )
+        for issue in batch:
+            if issue["key"] in summaries:
+                self.summary_cache.set(summary_key(issue), summaries[issue["key"]])
+        return summaries
+
+    def summarize_twins(self, twins, gpt_text=None):
+        """Analysis rows for issues sharing the same bug info
+
+        GPT is called once for all of them unless gpt_text is given.
+        """
+        if gpt_text is None:
+            gpt_text = self.request_summary(twins[0])
+        return [self.summarize_issue(twin, gpt_text) for twin in twins]
+
+    def request_summary(self, issue):
+        """GPT summary for an issue, None when GPT fails"""
+        prompt = f"""
+        Provide a bug summary with each section on a new line in format:
+        Impact: [customer impact]
+        Fix: [solution]
+        Test: [key test scenario]
+
+        Bug info:
+        {describe_bug(issue["fields"])}
+        """
+        try:
+            gpt_text = self.complete(prompt, SUMMARY_MAX_TOKENS)
+        except openai.OpenAIError as e:
+            # complete() already retried transient errors
+            logger.warning("Could not summarize %s: %s", issue["key"], e)
+            return None
+        self.summary_cache.set(summary_key(issue), gpt_text)
+        return gpt_text
+
+    def summarize_issue(self, issue, gpt_text):
+        """Analysis row for an issue and its GPT summary"""
+        fields = issue["fields"]
+        link = f"<{self.browse_url}/{issue['key']}|View in Jira>"
+        title_link = f"*{fields.get('summary', '')}*\n{link}"
+        if gpt_text is None:
+            # Issues without a summary are left out of the analysis
+            return extract_row(issue, None, None)
+
+        # Add line breaks between sections and make labels bold
+        gpt_text = GPT_SECTION_LABELS.sub(r"\n*\g<0>*", gpt_text.strip())
+
+        # Add priority information with appropriate emoji
+        priority = (fields.get("priority") or {}).get("name", "")
+        priority_class = next((c for c in PRIORITY_CLASSES if c in priority), None)
+        if priority_class:
+            emoji = PRIORITY_EMOJI[priority_class]
+            title_link = f"{emoji} *{priority_class}* | {title_link}"
+
+        # Extra newline at the end separates summaries
+        return extract_row(issue, f"{title_link}\n{gpt_text}\n", priority_class)
+
+    def iter_issue_pages(self, jql):
+        """Yield pages of issues matching jql as plain JSON dicts
+
+        Goes straight to the REST search endpoint on the pooled session,
+        skipping jira-python's Resource objects, and requests only the fields
+        we read. The first page gives the total, the rest are fetched in
+        parallel and yielded in order as they arrive. Issues pushed past that
+        total by ones created mid-search are fetched afterwards.
+        """
+        url = self.jira._get_url("search")
+
+        def fetch_page(start_at, page_size):
+            response = self.jira._session.get(
+                url,
+                params={
+                    "jql": jql,
+                    "fields": ",".join(ISSUE_FIELDS),
+                    "startAt": start_at,
+                    "maxResults": page_size,
+                },
+            )
+            response.raise_for_status()
+            return json.loads(response.content)
+
+        first_page = fetch_page(0, self.jira_page_size)
+        yield first_page["issues"]
+        if not first_page["issues"]:
+            return
+
+        # The server may cap the page size below what we asked for
+        page_size = first_page.get("maxResults") or len(first_page["issues"])
+        starts = range(len(first_page["issues"]), first_page["total"], page_size)
+        total = first_page["total"]
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=JIRA_SEARCH_CONCURRENCY
+        ) as executor:
+            pages = executor.map(
+                lambda start_at: fetch_page(start_at, page_size), starts
+            )
+            for page in pages:
+                total = max(total, page["total"])
+                yield page["issues"]
+
+        start_at = starts[-1] + page_size if starts else len(first_page["issues"])
+        while start_at < total:
+            page = fetch_page(start_at, page_size)
+            if not page["issues"]:
+                return
+            yield page["issues"]
+            total = page["total"]
+            start_at += page_size
+
+    def complete(self, prompt, max_tokens=300, **options):
+        """Run a GPT completion within the rate limits, retrying transient errors
+
+        Raises EmptyCompletionError rather than returning an empty reply.
+        """
+        # Rough token estimate of the prompt plus the reply
+        tokens = len(prompt) // CHARS_PER_TOKEN + max_tokens
+        for attempt in range(OPENAI_MAX_ATTEMPTS):
+            self.openai_throttler.wait(tokens)
+            self.openai_aimd.acquire()
+            started = time.monotonic()
+            try:
+                raw = self.openai_client.chat.completions.with_raw_response.create(
+                    model=OPENAI_MODEL,
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=max_tokens,
+                    temperature=0.7,
+                    **options,
+                )
+            except OPENAI_TRANSIENT_ERRORS as e:
+                self.openai_aimd.release(throttled=True)
+                if attempt == OPENAI_MAX_ATTEMPTS - 1:
+                    raise
+                delay = retry_delay(e, attempt)
+                logger.warning("GPT call failed (%s), retrying in %.1fs", e, delay)
+                time.sleep(delay)
+                continue
+            except Exception:
+                self.openai_aimd.release()
+                raise
+            self.openai_aimd.release(latency=time.monotonic() - started)
+            self.openai_throttler.update(raw.headers, tokens)
+            choice = raw.parse().choices[0]
+            if not choice.message.content:
+                raise EmptyCompletionError(
+                    f"GPT returned no content (finish reason {choice.finish_reason})"
+                )
+            return choice.message.content
+
     def extract_flows(self, text, flow_type="general"):
         """Extract meaningful flows from text"""
         if not isinstance(text, str):
@@ -225,115 +581,208 @@ class JiraAnalyzer:
         # Different extraction strategies based on field type
         if flow_type == "steps":
             # Extract numbered steps or bullet points
-            steps = re.split(r"\d+\.|•|\*|\n-", text)
-            flows.extend([s.strip() for s in steps if len(s.strip()) > 10])
+            steps = (s.strip() for s in STEP_SEPARATORS.split(text))
+            flows.extend(s for s in steps if len(s) > 10)
 
         elif flow_type == "root_cause":
             # Look for cause-effect patterns
-            sentences = text.split(".")
-            for sentence in sentences:
-                if any(
-                    word in sentence.lower()
-                    for word in ["when", "if", "because", "due to"]
-                ):
-                    flows.append(sentence.strip())
+            flows.extend(s.strip() for s in text.split(".") if CAUSE_WORDS.search(s))
 
         elif flow_type == "requirements":
             # Look for requirement-style statements
-            sentences = text.split(".")
-            for sentence in sentences:
-                if any(
-                    word in sentence.lower()
-                    for word in ["should", "must", "needs to", "expected"]
-                ):
-                    flows.append(sentence.strip())
+            flows.extend(
+                s.strip() for s in text.split(".") if REQUIREMENT_WORDS.search(s)
+            )
 
         return [f for f in flows if f]  # Remove empty flows
 
-    def get_component_analysis(self, component_name):
-        """Get analysis for a specific component with retries"""
+    def get_component_analysis(self, component_name, force_refresh=False):
+        """Get analysis for a specific component, served from a short-lived cache
+
+        Viewing a component and then exporting it reuses the same analysis
+        instead of fetching and summarizing every issue again.
+        """
+        analyses = self.get_multi_component_analysis([component_name], force_refresh)
+        return analyses[component_name]
+
+    def get_multi_component_analysis(self, component_names, force_refresh=False):
+        """Get analyses for several components, keyed by component name
+
+        Components without a cached analysis are fetched with one search and
+        summarized together.
+        """
+        # A forced refresh only accepts analyses built after it was requested
+        since = time.time()
+        if not force_refresh:
+            since -= self.ANALYSIS_CACHE_DURATION
+        analyses = self.cached_analyses(component_names, since)
+        missing = [name for name in component_names if name not in analyses]
+        if not missing:
+            return analyses
+
+        # Concurrent cold calls for a component share one build instead of
+        # each running it. Locks are taken in order so overlapping lists of
+        # components can't deadlock.
+        with contextlib.ExitStack() as stack:
+            for cache_key in sorted({name.lower() for name in missing}):
+                stack.enter_context(self.analysis_lock(cache_key))
+
+            analyses.update(self.cached_analyses(missing, since))
+            missing = [name for name in missing if name not in analyses]
+            if missing:
+                # A forced refresh also regenerates the GPT summaries
+                built, incomplete = self.build_component_analysis(
+                    missing, use_cache=not force_refresh
+                )
+                analyses.update(built)
+                # Analyses missing summaries aren't cached, so the next request
+                # retries the failed ones instead of serving the gaps
+                with self.analysis_locks_lock:
+                    for component_name, analysis in built.items():
+                        if component_name not in incomplete:
+                            self.analysis_cache[component_name.lower()] = (
+                                time.time(),
+                                analysis,
+                            )
+        self.evict_expired_analyses()
+        return analyses
+
+    def evict_expired_analyses(self):
+        """Drop expired analyses and the locks of components not being built"""
+        expired = time.time() - self.ANALYSIS_CACHE_DURATION
+        with self.analysis_locks_lock:
+            for cache_key, (built_at, _) in list(self.analysis_cache.items()):
+                if built_at <= expired:
+                    del self.analysis_cache[cache_key]
+            for cache_key, lock in list(self.analysis_locks.items()):
+                if cache_key not in self.analysis_cache and not lock.locked():
+                    del self.analysis_locks[cache_key]
+
+    def cached_analyses(self, component_names, since):
+        """Cached analyses of the components built after since, by name"""
+        analyses = {}
+        for component_name in component_names:
+            cached = self.analysis_cache.get(component_name.lower())
+            if cached and cached[0] > since:
+                analyses[component_name] = cached[1]
+        return analyses
+
+    def analysis_lock(self, cache_key):
+        """Lock held while building the analysis of a component"""
+        with self.analysis_locks_lock:
+            return self.analysis_locks.setdefault(cache_key, Lock())
+
+    def build_component_analysis(self, component_names, use_cache=True):
+        """Build analyses for a list of components with retries
+
+        Returns the analyses by component name and the names of components
+        with issues GPT failed to summarize.
+        """
         for attempt in range(self.max_retries):
             try:
                 # Get all issues
-                issues_data = self.process_production_issues(component_name)
-                if not issues_data:
-                    return {}
-
-                # Extract all unique component names
-                all_components = set()
-                for issue in issues_data:
-                    if isinstance(issue.get('components'), list):
-                        all_components.update(issue['components'])
-
-                # Filter for case-insensitive component match
-                component_data = [
-                    issue
-                    for issue in issues_data
-                    if isinstance(issue.get('components'), list)
-                    and any(
-                        c.lower() == component_name.lower() for c in issue['components']
+                issues_data = self.process_production_issues(
+                    component_names, use_cache=use_cache
+                )
+                analyses = {
+                    component_name: group_flows(issues_data, component_name)
+                    for component_name in component_names
+                }
+                incomplete = {
+                    component_name
+                    for component_name in component_names
+                    if any(
+                        row.gpt_summary is None
+                        and component_name.lower() in row.components_lower
+                        for row in issues_data
                     )
-                ]
-
-                customer_flows = {}
-                for idx, issue in enumerate(component_data):
-                    customer = issue.get("customer", None)
-
-                    if not customer:
-                        continue
-
-                    if customer not in customer_flows:
-                        customer_flows[customer] = {
-                            "Class 1": [],
-                            "Class 2": [],
-                            "Class 3": [],
-                        }
-
-                    # Extract priority from the GPT summary text which contains the priority emoji
-                    gpt_summary = issue.get("gpt_summary", "")
-
-                    if "🔴" in gpt_summary:
-                        priority = "Class 1"
-                    elif "🟧" in gpt_summary:
-                        priority = "Class 2"
-                    elif "🟡" in gpt_summary:
-                        priority = "Class 3"
-                    else:
-                        continue
-
-                    # Add the GPT summary to the appropriate priority list
-                    if gpt_summary:
-                        customer_flows[customer][priority].append(gpt_summary)
-
-                return customer_flows
+                }
+                return analyses, incomplete
 
-            except Exception as e:
+            # Only JIRA failures are retried: GPT errors are retried inside
+            # complete(), and finished summaries are cached, so a retry
+            # doesn't pay for them again
+            except (JIRAError, RequestException) as e:
                 if attempt < self.max_retries - 1:
                     wait_time = (attempt + 1) * 2  # Exponential backoff
                     time.sleep(wait_time)
                 else:
                     raise
 
-    def get_available_components(self):
-        """Get list of all available components with retries"""
-        for attempt in range(self.max_retries):
+    def get_project_keys(self):
+        """Keys of every visible project, paged from /project/search
+
+        Only the keys are needed, so this avoids loading every project's full
+        details through the deprecated /project endpoint. Servers without
+        /project/search (JIRA Data Center) fall back to it.
+        """
+        url = self.jira._get_url("project/search")
+        keys = []
+        while True:
             try:
-                # Get all components from JIRA
-                projects = self.jira.projects()
+                response = self.jira._session.get(
+                    url, params={"startAt": len(keys), "maxResults": 100}
+                )
+            except JIRAError as e:
+                if e.status_code != 404:
+                    raise
+                return [project.key for project in self.jira.projects()]
+            response.raise_for_status()
+            page = json.loads(response.content)
+            keys.extend(project["key"] for project in page["values"])
+            if page.get("isLast", True) or not page["values"]:
+                return keys
+
+    def components_cached(self):
+        """Whether the component list was fetched within CACHE_DURATION"""
+        if not self.last_refresh:
+            return False
+        return time.time() - self.last_refresh < self.CACHE_DURATION
 
-                all_components = []
-                for project in projects:
-                    components = self.jira.project_components(project.key)
-                    all_components.extend([comp.name for comp in components])
+    def get_available_components(self):
+        """Get list of all available components, cached for CACHE_DURATION"""
+        if self.components_cached():
+            return self.component_cache["all"]
 
-                return all_components
+        # Concurrent cold calls share one refresh instead of each fetching
+        with self.component_lock:
+            if self.components_cached():
+                return self.component_cache["all"]
 
-            except Exception as e:
-                if attempt < self.max_retries - 1:
-                    wait_time = (attempt + 1) * 2  # Exponential backoff
-                    time.sleep(wait_time)
-                else:
-                    raise
+            for attempt in range(self.max_retries):
+                try:
+                    # Get all components from JIRA
+                    project_keys = self.get_project_keys()
+
+                    # Fetch every project's components concurrently over the pool
+                    with concurrent.futures.ThreadPoolExecutor(
+                        max_workers=max(1, min(16, len(project_keys)))
+                    ) as executor:
+                        project_components = executor.map(
+                            self.jira.project_components, project_keys
+                        )
+                        all_components = [
+                            comp.name
+                            for components in project_components
+                            for comp in components
+                        ]
+
+                    self.component_cache = {
+                        "all": all_components,
+                        # Reversed so the first spelling of a name wins
+                        "lower_to_canonical": {
+                            c.lower(): c for c in reversed(all_components)
+                        },
+                    }
+                    self.last_refresh = time.time()
+                    return all_components
+
+                except Exception as e:
+                    if attempt < self.max_retries - 1:
+                        wait_time = (attempt + 1) * 2  # Exponential backoff
+                        time.sleep(wait_time)
+                    else:
+                        raise
 
     def format_slack_message(self, analysis):
         def create_message_batch(blocks, batch_number, total_batches):
@@ -357,14 +806,47 @@ class JiraAnalyzer:
                         },
                     }
                 )
-            return header + blocks
+            header.extend(blocks)
+            return header
+
+        def iter_issue_blocks(priorities):
+            """Yield the title, details and divider blocks of each summary"""
+            for priority in PRIORITY_CLASSES:
+                for item in priorities[priority]:
+                    # Extract the title, Jira link and details in one split
+                    lines = item.split("\n", 2)
+                    title = lines[0]
+                    jira_link = lines[1] if len(lines) > 1 else ""
+                    details = lines[2].strip() if len(lines) > 2 else ""
+
+                    # Create a section with title and link
+                    yield {
+                        "type": "section",
+                        "text": {"type": "mrkdwn", "text": f"{title}\n{jira_link}"},
+                    }
+
+                    # Add details in a code block for clean formatting
+                    if details:
+                        formatted_details = SLACK_SECTION_PATTERN.sub(
+                            lambda m: SLACK_SECTION_LABELS[m.group(0)], details
+                        )
+                        yield {
+                            "type": "section",
+                            "text": {
+                                "type": "mrkdwn",
+                                "text": f"```{formatted_details}```",
+                            },
+                        }
+
+                    # Add a small divider between issues
+                    yield SLACK_DIVIDER
 
         if not analysis or not isinstance(analysis, dict):
             return []
 
         all_blocks = []
         for customer, priorities in analysis.items():
-            customer_blocks = [
+            all_blocks.append(
                 {
                     "type": "header",
                     "text": {
@@ -373,66 +855,17 @@ class JiraAnalyzer:
                         "emoji": True,
                     },
                 }
-            ]
-
-            # Process each priority in order
-            for priority in ["Class 1", "Class 2", "Class 3"]:
-                if priorities[priority]:  # If there are issues in this priority
-                    for item in priorities[priority]:
-                        # Extract the title and Jira link
-                        title_parts = item.split("\n", 1)
-                        title = title_parts[0] if len(title_parts) > 0 else ""
-                        content_parts = (
-                            title_parts[1].split("\n", 1)
-                            if len(title_parts) > 1
-                            else ["", ""]
-                        )
-                        jira_link = content_parts[0]
-                        details = content_parts[1] if len(content_parts) > 1 else ""
-
-                        # Create a section with title and link
-                        customer_blocks.append(
-                            {
-                                "type": "section",
-                                "text": {
-                                    "type": "mrkdwn",
-                                    "text": f"{title}\n{jira_link}",
-                                },
-                            }
-                        )
-
-                        # Add details in a code block for clean formatting
-                        if details.strip():
-                            formatted_details = (
-                                details.strip()
-                                .replace("*Impact:*", "*IMPACT*")
-                                .replace("*Fix:*", "*FIX*")
-                                .replace("*Test:*", "*TEST*")
-                            )
-
-                            customer_blocks.append(
-                                {
-                                    "type": "section",
-                                    "text": {
-                                        "type": "mrkdwn",
-                                        "text": f"```{formatted_details}```",
-                                    },
-                                }
-                            )
-
-                        # Add a small divider between issues
-                        customer_blocks.append({"type": "divider"})
-
-            all_blocks.extend(customer_blocks)
-
-        # Split into batches of 45 blocks
-        batch_size = 45
-        batches = [
-            all_blocks[i : i + batch_size]
-            for i in range(0, len(all_blocks), batch_size)
-        ]
+            )
+            all_blocks.extend(iter_issue_blocks(priorities))
 
+        # Split into batches as large as Slack allows, leaving room for the
+        # header, the completion note and the download button added by the bot
+        batch_size = SLACK_MAX_BLOCKS - 3
+        total_batches = math.ceil(len(all_blocks) / batch_size)
+        blocks = iter(all_blocks)
         return [
-            create_message_batch(batch, i + 1, len(batches))
-            for i, batch in enumerate(batches)
+            create_message_batch(
+                itertools.islice(blocks, batch_size), i + 1, total_batches
+            )
+            for i in range(total_batches)
         ]
@@ -0,0 +1,128 @@
+import math
+import random
+import re
+import time
+from collections import deque
+from statistics import mean
+from threading import Condition, Lock
+
+WINDOW = 60.0  # OpenAI limits are per minute
+
+DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+def parse_reset(value):
+    """Seconds in an x-ratelimit-reset-* header value such as '6m0s' or '20ms'"""
+    return sum(
+        float(amount) * DURATION_UNITS[unit]
+        for amount, unit in DURATION_PART.findall(value or "")
+    )
+
+
+class RequestThrottler:
+    """Keeps OpenAI calls within a requests and tokens per minute budget
+
+    Calls made in the last minute are tracked locally and new ones block until
+    they fit. Rate limit headers from responses can additionally pause calls
+    until the server-side window resets, which catches usage from other
+    processes sharing the API key. A limit of 0 or less disables that limit.
+    """
+
+    def __init__(self, rpm, tpm):
+        self.rpm = rpm if rpm > 0 else math.inf
+        self.tpm = tpm if tpm > 0 else math.inf
+        self.calls = deque()  # (timestamp, tokens)
+        self.tokens = 0
+        self.paused_until = 0
+        self.lock = Lock()
+
+    def wait(self, tokens):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                while self.calls and now - self.calls[0][0] >= WINDOW:
+                    self.tokens -= self.calls.popleft()[1]
+
+                fits = len(self.calls) < self.rpm and (
+                    not self.calls or self.tokens + tokens <= self.tpm
+                )
+                if fits and now >= self.paused_until:
+                    self.calls.append((now, tokens))
+                    self.tokens += tokens
+                    return
+
+                # Sleep until the oldest call leaves the window or the pause ends
+                delay = self.paused_until - now
+                if not fits:
+                    delay = max(delay, self.calls[0][0] + WINDOW - now)
+            time.sleep(max(delay, 0.05))
+
+    def update(self, headers, tokens):
+        """Pause when the server reports the budget for another call is spent"""
+        reset = 0
+        remaining_requests = headers.get("x-ratelimit-remaining-requests")
+        if remaining_requests is not None and int(remaining_requests) <= 0:
+            reset = parse_reset(headers.get("x-ratelimit-reset-requests"))
+        remaining_tokens = headers.get("x-ratelimit-remaining-tokens")
+        if remaining_tokens is not None and int(remaining_tokens) < tokens:
+            reset = max(reset, parse_reset(headers.get("x-ratelimit-reset-tokens")))
+        if reset:
+            with self.lock:
+                self.paused_until = max(self.paused_until, time.monotonic() + reset)
+
+
+def retry_delay(error, attempt, cap=30.0):
+    """Honor Retry-After when the error carries it, else back off with jitter"""
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    try:
+        return min(float(retry_after), cap)
+    except (TypeError, ValueError):
+        return random.uniform(0, min(cap, 2**attempt))
+
+
+class AIMDController:
+    """Adapts how many GPT calls run at once, like TCP congestion control
+
+    Each fast success raises the limit additively, while a rate limit or
+    server error cuts it multiplicatively so the pool backs off quickly and
+    then probes its way back up.
+    """
+
+    def __init__(
+        self,
+        start,
+        minimum=1,
+        maximum=32,
+        increase=0.5,
+        decrease=0.5,
+        latency_target=4.0,
+        window=20,
+    ):
+        self.limit = float(start)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.latencies = deque(maxlen=window)
+        self.active = 0
+        self.condition = Condition()
+
+    def acquire(self):
+        with self.condition:
+            while self.active >= int(self.limit):
+                self.condition.wait()
+            self.active += 1
+
+    def release(self, latency=None, throttled=False):
+        with self.condition:
+            self.active -= 1
+            if throttled:
+                self.limit = max(self.minimum, self.limit * self.decrease)
+            elif latency is not None:
+                self.latencies.append(latency)
+                if mean(self.latencies) <= self.latency_target:
+                    self.limit = min(self.maximum, self.limit + self.increase)
+            self.condition.notify_all()
@@ -0,0 +1,44 @@
+import os
+import sqlite3
+import time
+from threading import Lock
+
+
+class SummaryCache:
+    """GPT summaries persisted in SQLite so unchanged issues are not re-summarized
+
+    Entries expire after ttl seconds. Callers key them by whatever identifies
+    the summarized content, so an edited issue simply misses the cache.
+    """
+
+    def __init__(self, path, ttl=30 * 86400):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.ttl = ttl
+        self.lock = Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.db:
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS summaries"
+                " (key TEXT PRIMARY KEY, summary TEXT, expires REAL)"
+            )
+            self.db.execute("DELETE FROM summaries WHERE expires <= ?", (time.time(),))
+
+    def get(self, key):
+        with self.lock:
+            row = self.db.execute(
+                "SELECT summary FROM summaries WHERE key = ? AND expires > ?",
+                (key, time.time()),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key, summary):
+        with self.lock, self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO summaries VALUES (?, ?, ?)",
+                (key, summary, time.time() + self.ttl),
+            )
+
+    def close(self):
+        with self.lock:
+            self.db.close()
@@ -0,0 +1,183 @@
+import pytest
+
+import bot
+from services.jira_client import JiraAnalyzer
+
+
+class FakeTimer:
+    """Timer that only fires when the test says so"""
+
+    def __init__(self, interval, function):
+        self.function = function
+        self.started = False
+        self.cancelled = False
+
+    def start(self):
+        self.started = True
+
+    def cancel(self):
+        self.cancelled = True
+
+
+@pytest.fixture
+def strategy_requests(monkeypatch):
+    """Strategy requests handled once the pending debounce timers fire"""
+    timers = []
+    handled = []
+
+    def make_timer(interval, function):
+        timer = FakeTimer(interval, function)
+        timers.append(timer)
+        return timer
+
+    def fire():
+        for timer in timers:
+            if timer.started and not timer.cancelled:
+                timer.function()
+        timers.clear()
+        return handled
+
+    monkeypatch.setattr(bot, "Timer", make_timer)
+    monkeypatch.setattr(bot, "pending_requests", {})
+    monkeypatch.setattr(bot, "processed_messages", set())
+    monkeypatch.setattr(
+        bot, "handle_strategy_request", lambda text, *args, **kw: handled.append(text)
+    )
+    return fire
+
+
+def test_debounce_keeps_only_the_latest_request(strategy_requests):
+    bot.debounce_strategy_request("jobs", "D1", "U1")
+    bot.debounce_strategy_request("billing", "D1", "U1")
+    bot.debounce_strategy_request("routing", "D2", "U2")
+    assert strategy_requests() == ["billing", "routing"]
+    assert bot.pending_requests == {}
+
+
+def test_edit_replaces_only_a_pending_request(strategy_requests):
+    message = {"channel": "D1", "channel_type": "im", "user": "U1"}
+    bot.handle_message_event({**message, "text": "jobs", "ts": "1.0"})
+    edit = {
+        **message,
+        "subtype": "message_changed",
+        "message": {"text": "billing", "user": "U1", "edited": {"ts": "2.0"}},
+    }
+    bot.handle_message_event(edit)
+    assert strategy_requests() == ["billing"]
+
+    # Once the request has started, a later edit doesn't start another
+    edit["message"] = {**edit["message"], "edited": {"ts": "3.0"}}
+    bot.handle_message_event(edit)
+    assert strategy_requests() == ["billing"]
+
+
+class FakeAnalyzer:
+    def __init__(self, components):
+        self.components = components
+        self.cached = False
+
+    def components_cached(self):
+        return self.cached
+
+    def get_available_components(self):
+        self.cached = True
+        return self.components
+
+
+def test_component_index_follows_the_analyzer_cache(monkeypatch):
+    jira_analyzer = FakeAnalyzer(["Job Scheduler", "Billing"])
+    monkeypatch.setattr(bot, "analyzer", jira_analyzer)
+    monkeypatch.setattr(bot, "components_cache", {"index": None, "components": None})
+    refreshes = []
+
+    index = bot.get_component_index(on_refresh=lambda: refreshes.append(1))
+    assert index == [
+        ("Billing", "billing", ["billing"]),
+        ("Job Scheduler", "job scheduler", ["job", "scheduler"]),
+    ]
+    assert bot.get_component_index(on_refresh=lambda: refreshes.append(2)) is index
+    assert refreshes == [1]
+
+    # A refreshed component list is indexed again
+    jira_analyzer.components = ["Routing"]
+    assert bot.get_component_index() == [("Routing", "routing", ["routing"])]
+
+
+
+SUMMARY = (
+    "🔴 *Class 1* | *Jobs fail to save*\n<https://jira/browse/ST-1|View in Jira>\n"
+    "\n*Impact:* Schedulers lose work\n\n*Fix:* Retry the save\n\n*Test:* Save twice\n"
+)
+COMPONENTS = ["Job Scheduler", "Work_Order Sync", "bugs_Export", "view_impact"]
+
+
+class RecordingSlackClient:
+    """Keeps the blocks of every message the bot posts or updates"""
+
+    def __init__(self):
+        self.blocks = []
+
+    def chat_postMessage(self, **message):
+        self.blocks.extend(message.get("blocks") or ())
+        return {"ts": "1.0"}
+
+    chat_update = chat_postMessage
+
+
+def action_ids(blocks):
+    return [
+        element["action_id"]
+        for block in blocks
+        if block["type"] == "actions"
+        for element in block["elements"]
+    ]
+
+
+@pytest.fixture
+def slack(monkeypatch):
+    slack = RecordingSlackClient()
+    monkeypatch.setattr(bot, "slack_client", slack)
+    monkeypatch.setattr(bot, "analyzer", JiraAnalyzer.__new__(JiraAnalyzer))
+    index = [(c, c.lower(), c.lower().split()) for c in COMPONENTS]
+    monkeypatch.setattr(bot, "get_component_index", lambda on_refresh=None: index)
+    return slack
+
+
+def dispatch(action_id):
+    """The handler and its bound arguments, and the component of an action_id"""
+    action_type, component = bot.ACTION_PATTERN.match(action_id).groups()
+    handler = bot.ACTION_HANDLERS[action_type]
+    return (getattr(handler, "func", handler), getattr(handler, "args", ())), component
+
+
+@pytest.mark.parametrize("component", COMPONENTS)
+def test_generated_actions_dispatch_to_their_handler(slack, component):
+    bot.handle_strategy_request("job work bugs view", "C1", ephemeral=False)
+    select = [a for a in action_ids(slack.blocks) if a.endswith(component)]
+
+    analysis = {"Acme": {"Class 1": [SUMMARY], "Class 2": [], "Class 3": []}}
+    options = action_ids(bot.get_analysis_options_blocks(component))
+    impact = action_ids(bot.create_view_blocks("impact", component, analysis, "C1"))
+    slack.blocks.clear()
+    bot.create_view_blocks("bugs", component, analysis, "C1")
+    bugs = action_ids(slack.blocks)
+
+    assert [dispatch(a) for a in select + options + impact + bugs] == [
+        ((bot.handle_component_selection, ()), component),
+        ((bot.handle_view_selection, ("impact",)), component),
+        ((bot.handle_view_selection, ("bugs",)), component),
+        ((bot.handle_download, (bot.download_impact_areas,)), component),
+        ((bot.handle_download, (bot.download_bugs,)), component),
+    ]
+
+
+def test_legacy_impact_download_action_still_dispatches():
+    assert dispatch("download_bugs_Export") == (
+        (bot.handle_download, (bot.download_bugs,)),
+        "Export",
+    )
+    # Buttons posted before the impact export became "download_impact_"
+    assert dispatch("download_Job Scheduler") == (
+        (bot.handle_download, (bot.download_impact_areas,)),
+        "Job Scheduler",
+    )
@@ -0,0 +1,88 @@
+import json
+from threading import Lock
+from types import SimpleNamespace
+
+import pytest
+
+from services.jira_client import JiraAnalyzer
+
+
+class FakeSearch:
+    """JIRA search endpoint over a list of issue keys, capping page sizes
+
+    Issues in created_mid_search are added to the top of the results once
+    the first page has been served, like new bugs under ORDER BY created DESC.
+    """
+
+    def __init__(self, keys, max_results=100, created_mid_search=()):
+        self.keys = list(keys)
+        self.max_results = max_results
+        self.created_mid_search = list(created_mid_search)
+        self.requests = []
+        self.lock = Lock()
+
+    def get(self, url, params):
+        with self.lock:
+            if len(self.requests) == 1:
+                self.keys[:0] = self.created_mid_search
+            self.requests.append((params["startAt"], params["maxResults"]))
+            size = min(params["maxResults"], self.max_results)
+            start = params["startAt"]
+            body = {
+                "issues": [{"key": key} for key in self.keys[start : start + size]],
+                "total": len(self.keys),
+                "maxResults": size,
+            }
+        return SimpleNamespace(
+            content=json.dumps(body).encode(), raise_for_status=lambda: None
+        )
+
+
+def search(session, page_size=100):
+    analyzer = JiraAnalyzer.__new__(JiraAnalyzer)
+    analyzer.jira = SimpleNamespace(_get_url=lambda path: path, _session=session)
+    analyzer.jira_page_size = page_size
+    return [issue["key"] for page in analyzer.iter_issue_pages("jql") for issue in page]
+
+
+KEYS = [f"ST-{n}" for n in range(95)]
+
+
+def test_pages_follow_the_server_page_size():
+    session = FakeSearch(KEYS, max_results=30)
+    assert search(session) == KEYS
+    assert sorted(session.requests) == [(0, 100), (30, 30), (60, 30), (90, 30)]
+
+
+@pytest.mark.parametrize("count", [0, 1, 30, 60])
+def test_no_request_past_the_last_page(count):
+    session = FakeSearch(KEYS[:count], max_results=30)
+    assert search(session) == KEYS[:count]
+    assert len(session.requests) == max(1, -(-count // 30))
+
+
+def test_issues_pushed_past_the_total_are_still_fetched():
+    session = FakeSearch(KEYS[:90], max_results=30, created_mid_search=["ST-new"])
+    keys = search(session)
+    # ST-89 is pushed past the first total of 90. The shift also repeats the
+    # last issue of each earlier page, which callers skip.
+    assert set(keys) == set(KEYS[:90])
+    assert len(keys) == 91
+
+
+def test_stops_on_an_empty_page():
+    session = FakeSearch(KEYS[:60], max_results=30)
+    session.get_original = session.get
+
+    def get(url, params):
+        response = session.get_original(url, params)
+        if params["startAt"]:
+            # Everything after the first page was deleted mid-search
+            return SimpleNamespace(
+                content=json.dumps({"issues": [], "total": 30}).encode(),
+                raise_for_status=lambda: None,
+            )
+        return response
+
+    session.get = get
+    assert search(session) == KEYS[:30]
@@ -0,0 +1,78 @@
+import pytest
+
+from services import openai_throttler
+from services.openai_throttler import AIMDController, RequestThrottler, parse_reset
+
+
+@pytest.fixture
+def clock(fake_time):
+    return fake_time(openai_throttler)
+
+
+def test_parse_reset():
+    assert parse_reset("6m0s") == 360
+    assert parse_reset("20ms") == pytest.approx(0.02)
+    assert parse_reset("1h2m3.5s") == 3723.5
+    assert parse_reset(None) == 0
+
+
+def test_throttler_blocks_until_tokens_leave_the_window(clock):
+    throttler = RequestThrottler(rpm=100, tpm=100)
+    throttler.wait(60)
+    assert clock.sleeps == []
+
+    throttler.wait(60)
+    assert clock.now == pytest.approx(60)
+    assert throttler.tokens == 60
+
+
+def test_throttler_limits_requests_per_minute(clock):
+    throttler = RequestThrottler(rpm=2, tpm=1000)
+    throttler.wait(1)
+    clock.now = 10
+    throttler.wait(1)
+    throttler.wait(1)
+    # The third call waits for the first to leave the window
+    assert clock.now == pytest.approx(60)
+
+
+def test_throttler_treats_zero_limits_as_unlimited(clock):
+    throttler = RequestThrottler(rpm=0, tpm=0)
+    for _ in range(3):
+        throttler.wait(10)
+    assert clock.sleeps == []
+    assert throttler.tokens == 30
+
+
+def test_throttler_pauses_when_server_budget_is_spent(clock):
+    throttler = RequestThrottler(rpm=100, tpm=1000)
+    throttler.update(
+        {"x-ratelimit-remaining-tokens": "5", "x-ratelimit-reset-tokens": "2s"},
+        tokens=10,
+    )
+    throttler.wait(10)
+    assert clock.now == pytest.approx(2)
+
+
+def test_aimd_increases_additively_on_fast_calls():
+    controller = AIMDController(start=4, maximum=5, increase=0.5, latency_target=2)
+    for expected in (4.5, 5, 5):
+        controller.acquire()
+        controller.release(latency=1)
+        assert controller.limit == expected
+
+
+def test_aimd_decreases_multiplicatively_on_throttling():
+    controller = AIMDController(start=8, minimum=3, decrease=0.5)
+    for expected in (4, 3):
+        controller.acquire()
+        controller.release(throttled=True)
+        assert controller.limit == expected
+
+
+def test_aimd_holds_when_calls_are_slow():
+    controller = AIMDController(start=4, latency_target=2)
+    controller.acquire()
+    controller.release(latency=5)
+    assert controller.limit == 4
+    assert controller.active == 0
@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from helpers.parse import (
+    ParsedFlow,
+    iter_parsed_flows,
+    parse_batch_summaries,
+    parse_flow_sections,
+)
+
+SUMMARY = (
+    "🔴 *Class 1* | *Jobs fail to save*\n<https://jira/browse/ST-1|View in Jira>\n"
+    "\n*Impact:* Schedulers lose work\n\n*Fix:* Retry the save\n\n*Test:* Save twice\n"
+)
+
+
+def test_parse_flow_sections():
+    assert parse_flow_sections(SUMMARY) == (
+        "Schedulers lose work",
+        "Retry the save",
+        "Save twice",
+    )
+
+
+def test_parse_flow_sections_missing_sections():
+    assert parse_flow_sections("title\n*Impact:* Slow\n*Test:* Time it") == (
+        "Slow",
+        "",
+        "Time it",
+    )
+    assert parse_flow_sections("title only") == ("", "", "")
+
+
+def test_iter_parsed_flows():
+    analysis = {"Acme": {"Class 1": [SUMMARY], "Class 2": []}}
+    assert list(iter_parsed_flows(analysis)) == [
+        ParsedFlow(
+            "Acme", "Class 1", "Schedulers lose work", "Retry the save", "Save twice"
+        )
+    ]
+
+
+def batch_reply(*items):
+    return json.dumps({"summaries": list(items)})
+
+
+def entry(key, impact="Slow", fix="Cache it", test="Time it"):
+    return {"key": key, "impact": impact, "fix": fix, "test": test}
+
+
+def test_parse_batch_summaries():
+    reply = batch_reply(entry("ST-1"), entry("ST-2", impact="Down"))
+    assert parse_batch_summaries(reply, ["ST-1", "ST-2"]) == {
+        "ST-1": "Impact: Slow\nFix: Cache it\nTest: Time it",
+        "ST-2": "Impact: Down\nFix: Cache it\nTest: Time it",
+    }
+
+
+@pytest.mark.parametrize(
+    "items",
+    [
+        pytest.param([entry("ST-1")], id="missing key"),
+        pytest.param([entry("ST-1"), entry("ST-2"), entry("ST-2")], id="duplicate"),
+        pytest.param([entry("ST-1"), entry("ST-9")], id="unknown key"),
+        pytest.param([entry("ST-1"), entry("ST-2", fix=" ")], id="empty section"),
+        pytest.param([entry("ST-1"), entry("ST-2", test=None)], id="null section"),
+        pytest.param([entry("ST-1"), "ST-2"], id="not an object"),
+    ],
+)
+def test_parse_batch_summaries_keeps_only_valid_entries(items):
+    summaries = parse_batch_summaries(batch_reply(*items), ["ST-1", "ST-2"])
+    assert list(summaries) == ["ST-1"]
+
+
+@pytest.mark.parametrize(
+    "reply", ["Impact: Slow", None, "[]", '{"summaries": {}}', '{"other": []}']
+)
+def test_parse_batch_summaries_rejects_malformed_replies(reply):
+    with pytest.raises(ValueError):
+        parse_batch_summaries(reply, ["ST-1"])
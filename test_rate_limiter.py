@@ -0,0 +1,58 @@
+from slack_sdk import WebClient
+from slack_sdk.http_retry.builtin_handlers import RateLimitErrorRetryHandler
+
+from messaging import rate_limiter
+from messaging.rate_limiter import RateLimitedWebClient, TokenBucket
+
+
+def test_token_bucket_bursts_then_refills_at_rate(fake_time):
+    clock = fake_time(rate_limiter)
+    bucket = TokenBucket(rate=2, burst=3)
+
+    # The full burst goes through at once, then calls are paced at the rate
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.sleeps == []
+    bucket.acquire()
+    bucket.acquire()
+    assert clock.sleeps == [0.5, 0.5]
+
+    # An idle bucket refills up to its burst and no further
+    clock.now += 10
+    clock.sleeps.clear()
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.sleeps == []
+    bucket.acquire()
+    assert clock.sleeps == [0.5]
+
+
+def test_web_client_paces_each_method_separately(fake_time, monkeypatch):
+    clock = fake_time(rate_limiter)
+    calls = []
+    monkeypatch.setattr(
+        WebClient,
+        "api_call",
+        lambda self, api_method, **kwargs: calls.append((api_method, clock.now)),
+    )
+    client = RateLimitedWebClient(token="xoxb-test", rate=1, burst=1)
+
+    client.chat_postMessage(channel="C1", text="one")
+    client.chat_update(channel="C1", ts="1.0", text="two")
+    client.chat_postMessage(channel="C1", text="three")
+
+    # Only the second chat.postMessage waits, chat.update has its own bucket
+    assert calls == [
+        ("chat.postMessage", 0),
+        ("chat.update", 0),
+        ("chat.postMessage", 1),
+    ]
+    assert sorted(client.buckets) == ["chat.postMessage", "chat.update"]
+
+
+def test_web_client_retries_rate_limited_calls():
+    client = RateLimitedWebClient(token="xoxb-test")
+    assert any(
+        isinstance(handler, RateLimitErrorRetryHandler)
+        for handler in client.retry_handlers
+    )
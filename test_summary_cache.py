@@ -0,0 +1,28 @@
+from services import summary_cache
+from services.summary_cache import SummaryCache
+
+
+def test_round_trip(tmp_path):
+    cache = SummaryCache(str(tmp_path / "cache" / "summaries.sqlite3"))
+    assert cache.get("ST-1") is None
+    cache.set("ST-1", "Impact: a")
+    cache.set("ST-1", "Impact: b")
+    assert cache.get("ST-1") == "Impact: b"
+    cache.close()
+
+    # Summaries survive reopening the database
+    cache = SummaryCache(str(tmp_path / "cache" / "summaries.sqlite3"))
+    assert cache.get("ST-1") == "Impact: b"
+    cache.close()
+
+
+def test_entries_expire_after_ttl(tmp_path, fake_time):
+    clock = fake_time(summary_cache)
+    cache = SummaryCache(str(tmp_path / "summaries.sqlite3"), ttl=60)
+    cache.set("ST-1", "Impact: a")
+
+    clock.now += 59
+    assert cache.get("ST-1") == "Impact: a"
+    clock.now += 1
+    assert cache.get("ST-1") is None
+    cache.close()